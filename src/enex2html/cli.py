@@ -1,11 +1,13 @@
 """Command-line interface for enex2html."""
 
 import argparse
+import logging
 import sys
 from pathlib import Path
 
 from . import __version__
 from .converter import EnexConverter
+from .utils import configure_logging, find_enex_files
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -69,6 +71,10 @@ def main() -> int:
     parser = create_parser()
     args = parser.parse_args()
 
+    if args.verbose:
+        # Show per-file details such as each saved media file
+        configure_logging(logging.DEBUG)
+
     # Validate input directory
     input_path = Path(args.input_dir)
     if not input_path.exists():
@@ -84,7 +90,7 @@ def main() -> int:
         return 1
 
     # Check for .enex files
-    enex_files = list(input_path.glob("*.enex"))
+    enex_files = find_enex_files(input_path)
     if not enex_files:
         print(f"Error: No .enex files found in: {args.input_dir}", file=sys.stderr)
         return 1
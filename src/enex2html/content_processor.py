@@ -1,19 +1,60 @@
 """Content processing for note HTML cleanup and media references."""
 
+import html
 import re
-from typing import Any
+from typing import Any, Optional
+from urllib.parse import quote
+
+# Patterns are compiled once at import; they run against every note
+_MEDIA_RE = re.compile(r'<en-media[^>]*hash="([^"]*)"[^>]*/?>')
+
+# Absolutely positioned full-width overlays
+_ABSOLUTE_OVERLAY_RE = re.compile(
+    r"<div[^>]*position\s*:\s*absolute[^>]*width\s*:\s*100%[^>]*z-index\s*:\s*\d+[^>]*>.*?</div>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Highslide overlay elements
+_HIGHSLIDE_RE = re.compile(
+    r"<div[^>]*highslide[^>]*>.*?</div>", re.DOTALL | re.IGNORECASE
+)
+
+# Extreme z-index values
+_Z_INDEX_RE = re.compile(r"z-index\s*:\s*\d{4,}", re.IGNORECASE)
+
+# Elements positioned off-screen
+_OFF_SCREEN_RE = re.compile(
+    r"<[^>]*style\s*=\s*[\"'][^\"']*top\s*:\s*-9999px[^\"']*[\"'][^>]*>.*?</[^>]+>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Cleanup passes in the order they must run, each with a lower-case substring
+# that any match has to contain
+_CLEANUP_PASSES = (
+    ("absolute", _ABSOLUTE_OVERLAY_RE, ""),
+    ("highslide", _HIGHSLIDE_RE, ""),
+    ("z-index", _Z_INDEX_RE, "z-index: 1"),
+    ("-9999px", _OFF_SCREEN_RE, ""),
+)
 
 
 class ContentProcessor:
     """Static class for processing note content with media references and HTML cleanup."""
 
     @staticmethod
-    def process(content: str, resources: dict[str, Any]) -> str:
+    def process(
+        content: str,
+        resources: dict[str, Any],
+        media_html: Optional[dict[str, str]] = None,
+    ) -> str:
         """Process note content to update media references and clean problematic HTML.
 
         Args:
             content: Original note content
-            resources: Resources dictionary mapping hash to (mime_type, data, filename)
+            resources: Resources dictionary mapping hash to (mime_type, filename)
+            media_html: Optional cache mapping hash to replacement HTML; pass the
+                same dictionary for every note of an ENEX file so each resource's
+                tag is only built once
 
         Returns:
             Processed content with updated media references and cleaned HTML
@@ -22,7 +63,9 @@ class ContentProcessor:
             return content
 
         # Replace en-media tags with proper HTML
-        content = ContentProcessor._replace_media_tags(content, resources)
+        content = ContentProcessor._replace_media_tags(
+            content, resources, {} if media_html is None else media_html
+        )
 
         # Clean problematic HTML elements
         content = ContentProcessor._clean_html(content)
@@ -30,51 +73,48 @@ class ContentProcessor:
         return content
 
     @staticmethod
-    def _replace_media_tags(content: str, resources: dict[str, Any]) -> str:
+    def _media_tag(mime_type: str, filename: str) -> str:
+        """Build the HTML img or link tag for a resource."""
+        # Sanitized names can still contain characters such as & % ' that must
+        # be URL-quoted in the link and escaped in the markup
+        url = html.escape(f"media/{quote(filename)}")
+        if mime_type.startswith("image/"):
+            return f'<img src="{url}" alt="Image" style="max-width: 100%;" />'
+        return f'<a href="{url}" target="_blank">{html.escape(filename)}</a>'
+
+    @staticmethod
+    def _replace_media_tags(
+        content: str, resources: dict[str, Any], media_html: dict[str, str]
+    ) -> str:
         """Replace ENEX en-media tags with HTML img or link tags."""
 
         def replace_media(match: re.Match[str]) -> str:
-            hash_value = match.group(1)
-            if hash_value in resources:
-                mime_type, data, filename = resources[hash_value]
-                if mime_type.startswith("image/"):
-                    return f'<img src="media/{filename}" alt="Image" style="max-width: 100%;" />'
-                else:
-                    return f'<a href="media/{filename}" target="_blank">{filename}</a>'
-            return match.group(0)
-
-        return re.sub(r'<en-media[^>]*hash="([^"]*)"[^>]*/?>', replace_media, content)
+            # Resource hashes are stored lower-case, whatever case the export uses
+            hash_value = match.group(1).lower()
+            tag = media_html.get(hash_value)
+            if tag is None:
+                entry = resources.get(hash_value)
+                if entry is None:
+                    return match.group(0)
+                tag = ContentProcessor._media_tag(*entry)
+                media_html[hash_value] = tag
+            return tag
+
+        return _MEDIA_RE.sub(replace_media, content)
 
     @staticmethod
     def _clean_html(content: str) -> str:
         """Remove problematic HTML elements that can break page layout."""
-        # Remove absolutely positioned full-width overlays
-        content = re.sub(
-            r"<div[^>]*position\s*:\s*absolute[^>]*width\s*:\s*100%[^>]*z-index\s*:\s*\d+[^>]*>.*?</div>",
-            "",
-            content,
-            flags=re.DOTALL | re.IGNORECASE,
-        )
-
-        # Remove highslide overlay elements
-        content = re.sub(
-            r"<div[^>]*highslide[^>]*>.*?</div>",
-            "",
-            content,
-            flags=re.DOTALL | re.IGNORECASE,
-        )
-
-        # Fix elements with extreme z-index values
-        content = re.sub(
-            r"z-index\s*:\s*\d{4,}", "z-index: 1", content, flags=re.IGNORECASE
-        )
-
-        # Remove elements positioned off-screen
-        content = re.sub(
-            r'<[^>]*style\s*=\s*["\'][^"\']*top\s*:\s*-9999px[^"\']*["\'][^>]*>.*?</[^>]+>',
-            "",
-            content,
-            flags=re.DOTALL | re.IGNORECASE,
-        )
+        # Most notes contain none of these markers; a substring check is far
+        # cheaper than a DOTALL regex scan, so only run the patterns that can
+        # match. The passes run in order, since one removal can expose or
+        # swallow another element; the markers are re-checked after a change.
+        lowered = content.lower()
+        for marker, pattern, replacement in _CLEANUP_PASSES:
+            if marker in lowered:
+                cleaned = pattern.sub(replacement, content)
+                if cleaned != content:
+                    content = cleaned
+                    lowered = content.lower()
 
         return content
@@ -1,12 +1,196 @@
 """Core converter logic for ENEX to HTML conversion."""
 
+import functools
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 from .content_processor import ContentProcessor
 from .html_generator import HtmlGenerator
 from .parser import EnexParser
 from .templates import TemplateEngine
-from .utils import sanitize_filename
+from .utils import configure_logging, find_enex_files, sanitize_filename
+
+
+def _write_text_parts(path: Path, parts: list[str]) -> int:
+    """Write text segments to a file as UTF-8.
+
+    Where available the encoded segments are submitted with a single
+    os.writev call instead of one write per segment.
+    """
+    buffers = [part.encode("utf-8") for part in parts]
+    if not hasattr(os, "writev"):
+        with path.open("wb") as fp:
+            fp.writelines(buffers)
+        return sum(map(len, buffers))
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        total = sum(map(len, buffers))
+        written = os.writev(fd, buffers)
+        if written < total:
+            # Short write: finish the remainder with plain writes
+            remaining = memoryview(b"".join(buffers))[written:]
+            while remaining:
+                remaining = remaining[os.write(fd, remaining) :]
+    finally:
+        os.close(fd)
+    return total
+
+
+class _BackgroundWriter:
+    """Writes files on a thread pool so disk I/O overlaps parsing.
+
+    File writes release the GIL, so the parser can keep decoding while earlier
+    files are still being written, and several writes can be in flight at once
+    to make use of the device's queue depth. Queued data is bounded by size,
+    not count, so pending attachments cannot pile up in memory: a submission
+    waits until it fits in the budget, or until the queue is empty when it is
+    larger than the whole budget.
+    """
+
+    def __init__(
+        self, max_workers: int = 16, max_pending_bytes: int = 32 * 1024 * 1024
+    ) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._max_pending_bytes = max_pending_bytes
+        self._pending_bytes = 0
+        self._pending_changed = threading.Condition()
+        self._futures: list[Future[int]] = []
+
+    def __enter__(self) -> "_BackgroundWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _release(self, size: int) -> None:
+        with self._pending_changed:
+            self._pending_bytes -= size
+            self._pending_changed.notify_all()
+
+    def _submit(self, size: int, fn: Callable[..., int], *args: Any) -> None:
+        # Blocks while the queue is full, throttling the parser to the disk
+        with self._pending_changed:
+            self._pending_changed.wait_for(
+                lambda: self._pending_bytes == 0
+                or self._pending_bytes + size <= self._max_pending_bytes
+            )
+            self._pending_bytes += size
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(lambda _: self._release(size))
+        self._futures.append(future)
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        """Queue a binary file write."""
+        self._submit(len(data), path.write_bytes, data)
+
+    def write_text_parts(self, path: Path, parts: list[str]) -> None:
+        """Queue a UTF-8 text file write given as segments to be written in order."""
+        # Characters stand in for the encoded size, which is not known yet
+        self._submit(sum(map(len, parts)), _write_text_parts, path, parts)
+
+    def wait(self) -> None:
+        """Block until all queued writes have finished, re-raising any error."""
+        for future in self._futures:
+            future.result()
+        self._futures.clear()
+
+
+def _init_worker(log_level: int) -> None:
+    """Set up logging in a worker process like in the parent."""
+    if log_level != logging.NOTSET:
+        configure_logging(log_level)
+
+
+def _process_one_enex(
+    enex_file: Path, output_dir: Path, theme: str
+) -> tuple[str, int, int]:
+    """Convert a single ENEX file in a worker process.
+
+    Module-level so it can be pickled. Any error is re-raised as a ValueError
+    naming the file: output from parallel workers does not show which file
+    failed, and some errors (such as lxml's) cannot be pickled back to the
+    parent.
+
+    Args:
+        enex_file: Path to the .enex file
+        output_dir: Root output directory
+        theme: Theme to use for templates ('light' or 'dark')
+
+    Returns:
+        Tuple of (enex_name, note_count, media_count)
+    """
+    try:
+        return _convert_one_enex(enex_file, output_dir, theme)
+    except Exception as e:
+        # Both XML parsers raise SyntaxError subclasses; lxml's str() appends
+        # the file name itself, so use the bare message
+        message = e.msg if isinstance(e, SyntaxError) and e.msg else str(e)
+        raise ValueError(f"{enex_file.name}: {message}") from e
+
+
+def _convert_one_enex(
+    enex_file: Path, output_dir: Path, theme: str
+) -> tuple[str, int, int]:
+    """Convert a single ENEX file into its own notebook directory.
+
+    Args:
+        enex_file: Path to the .enex file
+        output_dir: Root output directory
+        theme: Theme to use for templates ('light' or 'dark')
+
+    Returns:
+        Tuple of (enex_name, note_count, media_count)
+    """
+    generator = HtmlGenerator(TemplateEngine(theme))
+
+    # Create directory for this ENEX file under notebooks/
+    enex_dir_name = sanitize_filename(enex_file.stem)
+    notebooks_dir = output_dir / "notebooks"
+    notebooks_dir.mkdir(exist_ok=True)
+    enex_dir_path = notebooks_dir / enex_dir_name
+    enex_dir_path.mkdir(exist_ok=True)
+
+    # Media files are saved into media/ as they are parsed
+    media_dir_path = enex_dir_path / "media"
+    resources: dict[str, tuple[str, str]] = {}
+    media_html: dict[str, str] = {}
+    notes: list[dict[str, Any]] = []
+
+    with _BackgroundWriter() as writer:
+        # Process each note as it is parsed and create individual HTML files
+        parsed_notes = EnexParser.parse_enex_file(
+            enex_file, media_dir_path, resources, writer.write_bytes
+        )
+        for i, note in enumerate(parsed_notes):
+            # Process content to update media references
+            note["content"] = ContentProcessor.process(
+                note["content"], resources, media_html
+            )
+
+            # Create individual note HTML file
+            note_filepath = enex_dir_path / generator.note_filename(note, i + 1)
+            note_parts = generator.note(note, enex_file.name)
+            writer.write_text_parts(note_filepath, note_parts)
+
+            # Only the index is built from the notes, so drop the body here
+            del note["content"]
+            notes.append(note)
+
+        # All notes and media must be on disk before the index links to them
+        writer.wait()
+
+    # Create index.html for this ENEX collection
+    index_html = generator.index(enex_file.name, notes)
+    index_filepath = enex_dir_path / "index.html"
+    index_filepath.write_bytes(index_html.encode("utf-8"))
+
+    return enex_file.name, len(notes), len(resources)
 
 
 class EnexConverter:
@@ -34,70 +218,44 @@ class EnexConverter:
 
     def convert(self) -> None:
         """Convert all ENEX files in the input directory."""
-        enex_notebooks = []
-
         print("Processing ENEX files...")
 
         # Copy theme assets (CSS files) to output directory
         self.template_engine.copy_assets_to(self.output_dir)
 
-        enex_files = list(self.input_dir.glob("*.enex"))
+        theme = self.template_engine.theme
+        enex_files = find_enex_files(self.input_dir)
         if not enex_files:
             print(f"No .enex files found in {self.input_dir}")
             return
 
-        for enex_file in enex_files:
-            print(f"Processing: {enex_file.name}")
-
-            notes, resources = EnexParser.parse_enex_file(enex_file)
-
-            # Create directory for this ENEX file under notebooks/
-            enex_dir_name = sanitize_filename(enex_file.stem)
-            notebooks_dir = self.output_dir / "notebooks"
-            notebooks_dir.mkdir(exist_ok=True)
-            enex_dir_path = notebooks_dir / enex_dir_name
-            enex_dir_path.mkdir(exist_ok=True)
-
-            # Create media directory if we have resources
-            if resources:
-                media_dir_path = enex_dir_path / "media"
-                media_dir_path.mkdir(exist_ok=True)
-
-                # Save all media files
-                for _resource_hash, (
-                    _mime_type,
-                    data,
-                    resource_filename,
-                ) in resources.items():
-                    media_file_path = media_dir_path / resource_filename
-                    media_file_path.write_bytes(data)
-                    print(f"  Saved media: {resource_filename}")
-
-            # Process each note and create individual HTML files
-            for i, note in enumerate(notes):
-                # Process content to update media references
-                note["content"] = ContentProcessor.process(note["content"], resources)
-
-                # Create individual note HTML file
-                safe_title = sanitize_filename(note["title"])
-                note_filename = f"note_{i + 1:03d}_{safe_title}.html"
-                note_filepath = enex_dir_path / note_filename
-
-                note_html = self.generator.note(note, enex_file.name)
-                note_filepath.write_text(note_html, encoding="utf-8")
-
-            # Create index.html for this ENEX collection
-            index_html = self.generator.index(enex_file.name, notes)
-            index_filepath = enex_dir_path / "index.html"
-            index_filepath.write_text(index_html, encoding="utf-8")
-
-            enex_notebooks.append((enex_file.name, len(notes)))
-            print(f"  Processed {len(notes)} notes, {len(resources)} media files")
+        # ENEX files are independent, so convert them in parallel worker processes
+        worker = functools.partial(
+            _process_one_enex, output_dir=self.output_dir, theme=theme
+        )
+        # No point starting more workers than there are files
+        max_workers = min(os.cpu_count() or 1, len(enex_files))
+        # Workers that are spawned rather than forked start without the CLI's
+        # logging setup, so hand them the level to configure
+        log_level = logging.getLogger(__package__).level
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(log_level,),
+        ) as executor:
+            # map() yields in input order, so the table of contents is deterministic
+            # and each file's summary is printed in one piece, in order
+            enex_notebooks: list[tuple[str, int]] = []
+            for enex_name, note_count, media_count in executor.map(worker, enex_files):
+                print(
+                    f"Processed {enex_name}: {note_count} notes, {media_count} media files"
+                )
+                enex_notebooks.append((enex_name, note_count))
 
         # Create main table of contents
         main_toc_html = self.generator.toc(enex_notebooks)
         main_toc_filepath = self.output_dir / "index.html"
-        main_toc_filepath.write_text(main_toc_html, encoding="utf-8")
+        main_toc_filepath.write_bytes(main_toc_html.encode("utf-8"))
 
         total_notes = sum(count for _, count in enex_notebooks)
 
@@ -110,7 +268,7 @@ class EnexConverter:
         print("\nNotebooks:")
         for enex_name, note_count in enex_notebooks:
             # Remove .enex extension for display
-            notebook_name = enex_name.replace(".enex", "")
+            notebook_name = enex_name.removesuffix(".enex")
             # Calculate padding for alignment (max 40 chars for name)
             padding = max(1, 40 - len(notebook_name))
             dots = "." * padding
@@ -1,6 +1,8 @@
 """HTML document generation using templates."""
 
+import html
 from typing import Any
+from urllib.parse import quote
 
 from . import __name__ as pkg_name
 from . import __url__ as pkg_url
@@ -26,8 +28,27 @@ class HtmlGenerator:
         self.version = pkg_version
         self.github_url = pkg_url
         self.project_name = pkg_name
+        # The footer is identical on every page; fill it in once
+        self.engine.bind(
+            version=self.version,
+            github_url=self.github_url,
+            project_name=self.project_name,
+        )
+
+    @staticmethod
+    def note_filename(note: dict[str, Any], number: int) -> str:
+        """Get the file name of a note's page.
+
+        Args:
+            note: Note dictionary with safe_title
+            number: 1-based position of the note in its ENEX file
 
-    def note(self, note: dict[str, Any], enex_name: str) -> str:
+        Returns:
+            File name of the note's HTML page
+        """
+        return f"note_{number:03d}_{note['safe_title']}.html"
+
+    def note(self, note: dict[str, Any], enex_name: str) -> list[str]:
         """Generate HTML for a single note.
 
         Args:
@@ -35,19 +56,20 @@ class HtmlGenerator:
             enex_name: Name of the ENEX file
 
         Returns:
-            Complete HTML content for the note
+            Complete HTML content for the note as segments to be written in order,
+            so long notes are never copied into one page-sized string
         """
-        # Remove .enex extension for display
-        display_name = enex_name.replace(".enex", "")
-
-        return self.engine.render(
-            "note",
+        # The enex name is the same for every note of a file, so bind it once
+        template_name = f"note:{enex_name}"
+        if template_name not in self.engine.templates:
+            # Remove .enex extension for display
+            display_name = enex_name.removesuffix(".enex")
+            self.engine.partial("note", template_name, enex_name=display_name)
+
+        return self.engine.render_parts(
+            template_name,
             title=note["title"],
-            enex_name=display_name,
             content=note["content"],
-            version=self.version,
-            github_url=self.github_url,
-            project_name=self.project_name,
         )
 
     def index(self, enex_name: str, notes: list[dict[str, Any]]) -> str:
@@ -55,28 +77,28 @@ class HtmlGenerator:
 
         Args:
             enex_name: Name of the ENEX file
-            notes: List of note dictionaries
+            notes: List of note dictionaries with title and safe_title, in order
 
         Returns:
             Complete HTML content for the ENEX index
         """
         # Remove .enex extension for display
-        display_name = enex_name.replace(".enex", "")
-
-        note_links = []
-        for i, note in enumerate(notes):
-            safe_title = sanitize_filename(note["title"])
-            filename = f"note_{i + 1:03d}_{safe_title}.html"
-            note_links.append(f'<li><a href="{filename}">{note["title"]}</a></li>')
+        display_name = enex_name.removesuffix(".enex")
+
+        note_filename = self.note_filename
+        note_links = "\n".join(
+            [
+                f'<li><a href="{quote(note_filename(note, number))}">'
+                f'{html.escape(note["title"])}</a></li>'
+                for number, note in enumerate(notes, 1)
+            ]
+        )
 
         return self.engine.render(
             "enex_index",
             enex_name=display_name,
             note_count=len(notes),
-            note_links="\n".join(note_links),
-            version=self.version,
-            github_url=self.github_url,
-            project_name=self.project_name,
+            note_links=note_links,
         )
 
     def toc(self, notebooks: list[tuple[str, int]]) -> str:
@@ -88,25 +110,23 @@ class HtmlGenerator:
         Returns:
             Complete HTML content for the main table of contents
         """
-        collection_links = []
-        total_notes = 0
-
-        for enex_name, note_count in notebooks:
-            # Remove .enex extension for both directory name and display
-            display_name = enex_name.replace(".enex", "")
-            dir_name = sanitize_filename(display_name)
-            collection_links.append(
-                f'<li><a href="notebooks/{dir_name}/index.html">{display_name}</a> '
+        # Remove .enex extension for both directory name and display
+        named = [
+            (enex_name.removesuffix(".enex"), note_count)
+            for enex_name, note_count in notebooks
+        ]
+        collection_links = "\n".join(
+            [
+                f'<li><a href="notebooks/{quote(sanitize_filename(name))}/index.html">'
+                f"{html.escape(name)}</a> "
                 f'<span class="note-count">({note_count} notes)</span></li>'
-            )
-            total_notes += note_count
+                for name, note_count in named
+            ]
+        )
 
         return self.engine.render(
             "main_toc",
-            collection_links="\n".join(collection_links),
+            collection_links=collection_links,
             total_collections=len(notebooks),
-            total_notes=total_notes,
-            version=self.version,
-            github_url=self.github_url,
-            project_name=self.project_name,
+            total_notes=sum(note_count for _, note_count in notebooks),
         )
@@ -1,15 +1,68 @@
 """Parser for Evernote ENEX files."""
 
-import base64
+import binascii
+import functools
 import hashlib
+import io
 import logging
 import mimetypes
+import mmap
+import os
 import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Union
 
 from .utils import sanitize_filename
 
+# pybase64 provides a SIMD-accelerated decoder with the same API; it is optional
+if TYPE_CHECKING:
+    from base64 import b64decode
+else:
+    try:
+        from pybase64 import b64decode
+    except ImportError:
+        from base64 import b64decode
+
+# lxml parses in C and can filter events by tag; it is optional as well
+if TYPE_CHECKING:
+    _lxml_etree: Any = None
+else:
+    try:
+        from lxml import etree as _lxml_etree
+    except ImportError:
+        _lxml_etree = None
+
+# Elements handled by the parser; everything else is only kept until its note ends
+_PARSED_TAGS = ("note", "resource")
+
+# Extensions for the MIME types that make up nearly all ENEX attachments, so the
+# common case skips mimetypes; the values match what mimetypes would return
+_COMMON_MIME_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/bmp": ".bmp",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+    "image/tiff": ".tiff",
+    "application/pdf": ".pdf",
+    "application/zip": ".zip",
+    "application/msword": ".doc",
+    "application/vnd.ms-excel": ".xls",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation": ".pptx",
+    "audio/mpeg": ".mp3",
+    "audio/mp4": ".m4a",
+    "audio/wav": ".wav",
+    "audio/amr": ".amr",
+    "video/mp4": ".mp4",
+    "video/quicktime": ".mov",
+    "text/plain": ".txt",
+    "text/html": ".html",
+}
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,10 +70,14 @@ class EnexParser:
     """Parses Evernote ENEX files and extracts notes and resources."""
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def _get_extension_for_mime(mime_type: str) -> str:
         """Get file extension for a given MIME type.
 
-        Uses multiple fallback strategies to ensure all MIME types get proper extensions:
+        Common attachment types are answered from a static table, and results
+        are cached since a notebook's attachments share a handful of MIME types.
+        Otherwise uses multiple fallback strategies to ensure all MIME types get
+        proper extensions:
         1. Python's mimetypes module (comprehensive standard library mapping)
         2. Extract extension from MIME type subtype (e.g., video/mp4 -> .mp4)
         3. Use .bin as final fallback
@@ -40,6 +97,10 @@ class EnexParser:
         # Remove MIME type parameters (e.g., "text/plain; charset=utf-8" -> "text/plain")
         base_mime = mime_type.split(";")[0].strip()
 
+        ext = _COMMON_MIME_EXTENSIONS.get(base_mime.lower())
+        if ext:
+            return ext
+
         # Strategy 1: Use Python's mimetypes module
         ext = mimetypes.guess_extension(base_mime, strict=False)
         if ext:
@@ -75,123 +136,239 @@ class EnexParser:
         return ".bin"
 
     @staticmethod
-    def _extract_resources(root: ET.Element) -> dict[str, tuple[str, bytes, str]]:
-        """Extract resources from ENEX XML root.
+    def _extract_resource(
+        resource: ET.Element,
+        media_dir: Path,
+        resources: dict[str, tuple[str, str]],
+        write_bytes: Callable[[Path, bytes], object],
+        used_filenames: set[str],
+    ) -> None:
+        """Decode a single resource element and save it to the media directory.
+
+        Only the metadata is kept in ``resources``. The decoded bytes are handed
+        to ``write_bytes`` right away, so the parser itself holds at most one
+        decoded attachment; the converter's background writer bounds how much
+        it queues. Resources that were already saved are skipped; when the
+        export supplies their hash this happens before anything is decoded.
 
         Args:
-            root: XML root element
-
-        Returns:
-            Dictionary mapping resource hash to (mime_type, data, filename) tuple
+            resource: XML resource element
+            media_dir: Directory to save the decoded media file into
+            resources: Dictionary mapping resource hash to (mime_type, filename)
+            write_bytes: Function used to save the decoded media file
+            used_filenames: Case-folded names already saved to the media
+                directory; a resource whose name is taken gets its hash
+                appended, so no two resources are written to the same file
         """
-        resources = {}  # hash -> (mime_type, data, filename)
-
-        for resource in root.findall(".//resource"):
-            data_elem = resource.find("data")
-            mime_elem = resource.find("mime")
-            attributes_elem = resource.find("resource-attributes")
-
-            if (
-                data_elem is not None
-                and mime_elem is not None
-                and data_elem.text is not None
-                and mime_elem.text is not None
-            ):
+        # Collect the children of interest in a single pass
+        data_elem = mime_elem = attributes_elem = hash_elem = None
+        for child in resource:
+            tag = child.tag
+            if tag == "data":
+                data_elem = child
+            elif tag == "mime":
+                mime_elem = child
+            elif tag == "resource-attributes":
+                attributes_elem = child
+            elif tag == "hash":
+                hash_elem = child
+
+        if (
+            data_elem is not None
+            and mime_elem is not None
+            and data_elem.text is not None
+            and mime_elem.text is not None
+        ):
+            try:
+                mime_type = mime_elem.text
+
+                # Use the hash from the export when present (a hash attribute or
+                # a <hash> child), so duplicates are never decoded and the
+                # decoded bytes do not need a second pass
+                resource_hash = resource.get("hash")
+                if not resource_hash and hash_elem is not None:
+                    resource_hash = hash_elem.text
+                resource_hash = (resource_hash or "").strip().lower()
+                if resource_hash in resources:
+                    return
+
                 # Decode base64 data
+                # ENEX wraps base64 at 76 columns; drop the whitespace in one C pass
+                raw = data_elem.text.encode("ascii").translate(None, b"\n\r \t")
+                # Release the base64 text before the decoded copy is built
+                data_elem.clear()
                 try:
-                    resource_data = base64.b64decode(data_elem.text)
-                    mime_type = mime_elem.text
-
-                    # Generate hash for the resource
-                    # MD5 required by ENEX format for resource identification (not for security)
-                    resource_hash = hashlib.md5(resource_data).hexdigest()  # noqa: S324
-
-                    # Try to get original filename
-                    filename = None
-                    if attributes_elem is not None:
-                        filename_elem = attributes_elem.find("filename")
-                        if filename_elem is not None:
-                            filename = filename_elem.text
-
-                    # Generate filename if not available
-                    if not filename:
-                        ext = EnexParser._get_extension_for_mime(mime_type)
-                        filename = f"resource_{resource_hash}{ext}"
-
-                    resources[resource_hash] = (
-                        mime_type,
-                        resource_data,
-                        sanitize_filename(filename),
-                    )
-                except Exception as e:
-                    print(f"Warning: Failed to process resource: {e}")
-
-        return resources
+                    # With whitespace gone the strict decoder applies, which is
+                    # pybase64's fastest SIMD path
+                    resource_data = b64decode(raw, validate=True)
+                except binascii.Error:
+                    resource_data = b64decode(raw, validate=False)
+                del raw
+
+                if not resource_hash:
+                    # MD5 required by ENEX format for resource identification
+                    resource_hash = hashlib.md5(
+                        resource_data, usedforsecurity=False
+                    ).hexdigest()
+                    if resource_hash in resources:
+                        return
+
+                # Try to get original filename
+                filename = None
+                if attributes_elem is not None:
+                    filename_elem = attributes_elem.find("filename")
+                    if filename_elem is not None:
+                        filename = filename_elem.text
+
+                # Generate filename if not available
+                if not filename:
+                    ext = EnexParser._get_extension_for_mime(mime_type)
+                    filename = f"resource_{resource_hash}{ext}"
+                filename = sanitize_filename(filename)
+                # Attachments often share names such as image.png; compare
+                # case-folded, since the file system may be case-insensitive
+                if filename.casefold() in used_filenames:
+                    name = Path(filename)
+                    filename = f"{name.stem}_{resource_hash}{name.suffix}"
+                used_filenames.add(filename.casefold())
+
+                # Create media directory on the first resource
+                if not resources:
+                    media_dir.mkdir(exist_ok=True)
+
+                write_bytes(media_dir / filename, resource_data)
+                logger.debug("Saved media: %s", filename)
+
+                resources[resource_hash] = (mime_type, filename)
+            except Exception as e:
+                print(f"Warning: Failed to process resource: {e}")
 
     @staticmethod
-    def _extract_notes(root: ET.Element) -> list[dict[str, Any]]:
-        """Extract notes from ENEX XML root.
+    def _extract_note(note: ET.Element) -> dict[str, Any]:
+        """Extract a single note element.
 
         Args:
-            root: XML root element
+            note: XML note element
 
         Returns:
-            List of note dictionaries with title, content, created, and updated fields
+            Note dictionary with title, safe_title, content, created, and updated
+            fields
+        """
+        title = content = created_date = updated_date = None
+        for child in note:
+            tag = child.tag
+            if tag == "title":
+                title = child.text
+            elif tag == "content":
+                content = child.text
+            elif tag == "created":
+                created_date = child.text
+            elif tag == "updated":
+                updated_date = child.text
+
+        if not title:
+            title = "Untitled"
+        if not content:
+            content = "<p>No content</p>"
+
+        return {
+            "title": title,
+            # Filename-safe form of the title, computed once for every use
+            "safe_title": sanitize_filename(title),
+            "content": content,
+            "created": created_date,
+            "updated": updated_date,
+        }
+
+    @staticmethod
+    def _iter_elements_lxml(enex_file: Path) -> Iterator[ET.Element]:
+        """Yield closed note and resource elements using lxml.
+
+        Only the tags of interest generate events, so the Python loop runs once
+        per note and resource rather than once per element. Elements are
+        cleared once the caller has handled them.
+        """
+        # huge_tree lifts libxml2's 10 MB text node limit (base64 attachments)
+        context = _lxml_etree.iterparse(
+            str(enex_file), events=("end",), tag=_PARSED_TAGS, huge_tree=True
+        )
+        for _, elem in context:
+            yield elem
+            elem.clear()
+            if elem.tag == "note":
+                # Drop earlier finished notes so the tree never grows
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    @staticmethod
+    def _iter_elements_stdlib(enex_file: Path) -> Iterator[ET.Element]:
+        """Yield closed note and resource elements using xml.etree.
+
+        Elements are cleared once the caller has handled them.
         """
-        notes = []
-
-        for note in root.findall(".//note"):
-            title_elem = note.find("title")
-            title = (
-                title_elem.text
-                if title_elem is not None and title_elem.text is not None
-                else "Untitled"
-            )
-            content_elem = note.find("content")
-            content = (
-                content_elem.text
-                if content_elem is not None and content_elem.text is not None
-                else "<p>No content</p>"
-            )
-
-            # Extract creation and modification dates if available
-            created = note.find("created")
-            created_date = created.text if created is not None else None
-
-            updated = note.find("updated")
-            updated_date = updated.text if updated is not None else None
-
-            notes.append(
-                {
-                    "title": title,
-                    "content": content,
-                    "created": created_date,
-                    "updated": updated_date,
-                }
-            )
-
-        return notes
+        # Map the file read-only: iterparse still copies it out in chunks, but
+        # each chunk is a memcpy from the page cache rather than a read() system
+        # call (the map keeps its own handle, so the file can be closed right
+        # away). An empty file cannot be mapped, so it is handed to the parser
+        # as an empty buffer, which reports the usual "no element found" error.
+        source: Union[mmap.mmap, io.BytesIO]
+        with enex_file.open("rb") as fp:
+            if os.fstat(fp.fileno()).st_size:
+                source = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                source = io.BytesIO()
+
+        with source:
+            # XML parsing required for ENEX format (trusted Evernote export files)
+            context = ET.iterparse(source, events=("start", "end"))  # noqa: S314
+            _, root = next(context)
+
+            for event, elem in context:
+                if event != "end" or elem.tag not in _PARSED_TAGS:
+                    continue
+
+                yield elem
+                elem.clear()
+                if elem.tag == "note":
+                    # Drop the finished note from the root so the tree never grows
+                    root.remove(elem)
 
     @staticmethod
     def parse_enex_file(
         enex_file: Path,
-    ) -> tuple[list[dict[str, Any]], dict[str, tuple[str, bytes, str]]]:
-        """Extract notes and resources from an Evernote ENEX file.
+        media_dir: Path,
+        resources: dict[str, tuple[str, str]],
+        write_bytes: Callable[[Path, bytes], object] = Path.write_bytes,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream notes and resources from an Evernote ENEX file.
+
+        The file is parsed incrementally, so only the note currently being read is
+        held in memory. Resources are children of their note, so every resource a
+        note references has been saved and added to ``resources`` by the time it
+        is yielded. Every resource is saved, whether or not a note references it,
+        and resources sharing a file name are saved under distinct names. lxml is
+        used when installed, otherwise xml.etree.
 
         Args:
             enex_file: Path to the .enex file
+            media_dir: Directory to save decoded media files into
+            resources: Dictionary to fill with hash -> (mime_type, filename)
+            write_bytes: Function used to save decoded media files, e.g. to hand
+                them to a background writer (defaults to Path.write_bytes)
 
-        Returns:
-            Tuple of (notes_list, resources_dict)
+        Yields:
+            Note dictionaries in document order
         """
-        # XML parsing required for ENEX format (trusted Evernote export files)
-        tree = ET.parse(enex_file)  # noqa: S314
-        root = tree.getroot()
-
-        # Extract resources first
-        resources = EnexParser._extract_resources(root)
-
-        # Extract notes
-        notes = EnexParser._extract_notes(root)
-
-        return notes, resources
+        if _lxml_etree is not None:
+            elements = EnexParser._iter_elements_lxml(enex_file)
+        else:
+            elements = EnexParser._iter_elements_stdlib(enex_file)
+
+        used_filenames = {filename.casefold() for _, filename in resources.values()}
+        for elem in elements:
+            if elem.tag == "resource":
+                EnexParser._extract_resource(
+                    elem, media_dir, resources, write_bytes, used_filenames
+                )
+            else:
+                yield EnexParser._extract_note(elem)
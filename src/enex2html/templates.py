@@ -1,9 +1,96 @@
 """Template loading and rendering engine."""
 
+import functools
+import html
+import re
 import shutil
 from pathlib import Path
 from typing import Any
 
+# Matches <%variable%> placeholders
+_PLACEHOLDER_RE = re.compile(r"<%(\w+)%>")
+
+# A template split around its placeholders: literal text at even indices and
+# placeholder names at odd indices, as produced by re.split with one group
+TemplateParts = tuple[str, ...]
+
+
+# Placeholders holding plain text, escaped when substituted; all others (note
+# content, prebuilt link lists, paths) are inserted as HTML
+_ESCAPED_KEYS = frozenset(
+    {"title", "enex_name", "note_count", "total_notes", "total_collections"}
+)
+
+
+def _format_value(key: str, value: Any) -> str:
+    """Convert a placeholder value to text, HTML-escaping plain-text keys."""
+    # Nearly every value is already a str; only the counts need converting
+    text = value if type(value) is str else str(value)
+    if key in _ESCAPED_KEYS:
+        return html.escape(text, quote=True)
+    return text
+
+
+def _substitute(parts: TemplateParts, values: dict[str, Any]) -> list[str]:
+    """Fill placeholders in split template parts; unknown ones are left as-is.
+
+    Returns:
+        List of string segments whose concatenation is the rendered template
+    """
+    segments = list(parts)
+    for i in range(1, len(parts), 2):
+        key = parts[i]
+        if key in values:
+            segments[i] = _format_value(key, values[key])
+        else:
+            segments[i] = f"<%{key}%>"
+    return segments
+
+
+def _bind(parts: TemplateParts, values: dict[str, Any]) -> TemplateParts:
+    """Fill some placeholders, merging their values into the adjacent literals.
+
+    Returns:
+        Split template parts containing only the placeholders not in ``values``
+    """
+    bound = [parts[0]]
+    for i in range(1, len(parts), 2):
+        key = parts[i]
+        if key in values:
+            bound[-1] += _format_value(key, values[key]) + parts[i + 1]
+        else:
+            bound += (key, parts[i + 1])
+    return tuple(bound)
+
+
+@functools.cache
+def _load_templates() -> dict[str, TemplateParts]:
+    """Load HTML templates from the templates directory.
+
+    Each template is split around its placeholders once here, so rendering
+    never has to search the template text. Cached so the files are read once
+    per process, however many engines are created. Callers must copy the
+    result before modifying it.
+    """
+    templates_dir = Path(__file__).parent / "templates"
+    templates = {}
+
+    template_files = {
+        "note": "note.html",
+        "enex_index": "enex_index.html",
+        "main_toc": "main_toc.html",
+    }
+
+    for template_name, filename in template_files.items():
+        template_path = templates_dir / filename
+        if template_path.exists():
+            text = template_path.read_text(encoding="utf-8")
+            templates[template_name] = tuple(_PLACEHOLDER_RE.split(text))
+        else:
+            raise FileNotFoundError(f"Template file not found: {template_path}")
+
+    return templates
+
 
 class TemplateEngine:
     """Loads and renders HTML templates with simple variable substitution."""
@@ -15,33 +102,37 @@ class TemplateEngine:
             theme: Theme to use for templates ('light' or 'dark')
         """
         self.theme = theme
-        self.templates = self._load_templates()
-
-    def _load_templates(self) -> dict[str, str]:
-        """Load HTML templates from the templates directory."""
-        templates_dir = Path(__file__).parent / "templates"
-        templates = {}
+        # Theme values never change for an engine, so they are bound into the
+        # templates once here rather than substituted on every render. This
+        # also copies the shared cache, which partial() extends per engine.
+        self.templates: dict[str, TemplateParts] = {}
+        self.bind(
+            # Theme name, so templates can construct their own paths
+            theme=theme,
+            # Button text shows the theme you'll switch TO, not the current one
+            theme_button_text="☀️" if theme == "dark" else "🌙",
+        )
+
+    def render_parts(self, template_name: str, **kwargs: Any) -> list[str]:
+        """Render a template into a list of string segments.
+
+        Uses <%variable%> syntax for placeholders, avoiding CSS conflicts. Plain
+        text values such as titles are HTML-escaped; HTML fragments such as the
+        note content are inserted as-is. The segments can be written out one by
+        one, so a large page never has to be assembled into a single string.
 
-        template_files = {
-            "note": "note.html",
-            "enex_index": "enex_index.html",
-            "main_toc": "main_toc.html",
-        }
-
-        for template_name, filename in template_files.items():
-            template_path = templates_dir / filename
-            if template_path.exists():
-                templates[template_name] = template_path.read_text(encoding="utf-8")
-            else:
-                raise FileNotFoundError(f"Template file not found: {template_path}")
+        Args:
+            template_name: Name of the template to render
+            **kwargs: Variables to substitute in the template
 
-        return templates
+        Returns:
+            List of segments whose concatenation is the rendered template
+        """
+        return _substitute(self.templates[template_name], kwargs)
 
     def render(self, template_name: str, **kwargs: Any) -> str:
         """Render a template with variable substitution.
 
-        Uses <%variable%> syntax for placeholders, avoiding CSS conflicts.
-
         Args:
             template_name: Name of the template to render
             **kwargs: Variables to substitute in the template
@@ -49,18 +140,31 @@ class TemplateEngine:
         Returns:
             Rendered template string
         """
-        template = self.templates[template_name]
+        return "".join(self.render_parts(template_name, **kwargs))
+
+    def bind(self, **kwargs: Any) -> None:
+        """Substitute variables that are the same for every render into all templates.
+
+        Args:
+            **kwargs: Variables to substitute now
+        """
+        templates = self.templates or _load_templates()
+        self.templates = {
+            name: _bind(parts, kwargs) for name, parts in templates.items()
+        }
 
-        # Add theme name to kwargs so templates can construct their own paths
-        kwargs["theme"] = self.theme
+    def partial(self, template_name: str, partial_name: str, **kwargs: Any) -> None:
+        """Register a copy of a template with some variables already substituted.
 
-        # Add theme button text (shows the theme you'll switch TO, not current theme)
-        kwargs["theme_button_text"] = "☀️" if self.theme == "dark" else "🌙"
+        Lets callers bind values that stay the same across many renders once, so
+        each later render of ``partial_name`` only fills in the remaining ones.
 
-        result = template
-        for key, value in kwargs.items():
-            result = result.replace(f"<%{key}%>", str(value))
-        return result
+        Args:
+            template_name: Name of the template to specialize
+            partial_name: Name to register the specialized template under
+            **kwargs: Variables to substitute now
+        """
+        self.templates[partial_name] = _bind(self.templates[template_name], kwargs)
 
     def copy_assets_to(self, output_dir: Path) -> None:
         """Copy theme CSS files and JavaScript to the output directory.
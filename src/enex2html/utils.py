@@ -1,11 +1,25 @@
 """Utility functions for ENEX to HTML conversion."""
 
+import functools
+import logging
+import os
 import re
+import sys
+from pathlib import Path
 
+# Invalid filename characters (including # which causes URL issues), replaced
+# with str.translate in a single C pass
+_INVALID_CHARS_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*#', "_"))
+_SEPARATORS_RE = re.compile(r"[ _]+")
 
+
+@functools.lru_cache(maxsize=8192)
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe file system use.
 
+    Results are cached since the same titles ("Untitled", ...) recur across notes
+    and each title is sanitized for both the note file and the index link.
+
     Args:
         filename: Original filename
 
@@ -15,13 +29,53 @@ def sanitize_filename(filename: str) -> str:
     if not filename:
         return "untitled"
 
-    # Remove or replace invalid characters (including # which causes URL issues)
-    filename = re.sub(r'[<>:"/\\|?*#]', "_", filename)
+    # Remove or replace invalid characters
+    filename = filename.translate(_INVALID_CHARS_TABLE)
     # Collapse multiple consecutive spaces or underscores
-    filename = re.sub(r"[ _]+", "_", filename)
+    filename = _SEPARATORS_RE.sub("_", filename)
     # Limit length to 150 chars (accounts for note_XXX_ prefix, .html suffix, and URL encoding)
     if len(filename) > 150:
         filename = filename[:150]
     # Remove leading/trailing spaces, dots, and underscores
-    filename = filename.strip("_. ")
-    return filename if filename else "untitled"
+    return filename.strip("_. ") or "untitled"
+
+
+def find_enex_files(directory: Path) -> list[Path]:
+    """Find .enex files directly inside a directory.
+
+    Uses os.scandir, which is cheaper than Path.glob for a flat listing since
+    no Path object or pattern match is needed for non-matching entries. Names
+    are compared with os.path.normcase, so like Path.glob the match ignores
+    case on Windows (e.g. Notes.ENEX).
+
+    Args:
+        directory: Directory to search
+
+    Returns:
+        List of paths to .enex files
+    """
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if os.path.normcase(entry.name).endswith(".enex") and entry.is_file()
+        ]
+
+
+def configure_logging(level: int) -> None:
+    """Send the package's log messages at ``level`` and above to stderr.
+
+    Only one handler is ever installed, so calling this again (for example in a
+    worker process that inherited the parent's configuration) just sets the
+    level.
+
+    Args:
+        level: Minimum logging level to show, e.g. logging.DEBUG
+    """
+    package_logger = logging.getLogger(__package__)
+    package_logger.setLevel(level)
+    if not package_logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        # Indented like the per-file progress lines they appear under
+        handler.setFormatter(logging.Formatter("  %(message)s"))
+        package_logger.addHandler(handler)